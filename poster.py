@@ -1,45 +1,224 @@
 # poster.py
 import os
 import re
+import mimetypes
 import time
-import json
-import yaml
+import tempfile
+import threading
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
 from datetime import datetime
 
-# load config
-with open("config.yaml", "r", encoding="utf-8") as f:
-    cfg = yaml.safe_load(f)
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    import json
 
-STATE_FILE = cfg.get("state_file", "state.json")
-IMAGE_ROOT = cfg["images"]["root_path"]
-HINDI_DOC = cfg["google_doc"].get("hindi_doc_id")
-EN_DOC = cfg["google_doc"].get("english_doc_id")
+    def _dumps(o):
+        return json.dumps(o, ensure_ascii=False, separators=(',', ':')).encode("utf-8")
+
+    _loads = json.loads
+
+# ----------------------------------------
+# Config
+# ----------------------------------------
+# defaults so helpers work after a plain `import poster`; _load_config() overrides them
+STATE_FILE = "state.json"
+DOC_CACHE_DIR = "doc_cache"
+IMAGE_INDEX_FILE = "image_index.json"
+IMAGE_ROOT = "images"
+HINDI_DOC = None
+EN_DOC = None
 # legacy single-string delimiter kept for compatibility but we now detect robust separators via regex
-SPLIT_DELIM = cfg["content"].get("split_delimiter", "\n\n")
-PREF_CAPTION = cfg["content"].get("prefer_caption_for_short_posts", False)
-CAP_LEN = int(cfg["content"].get("caption_max_length", 1000))
-POSTS_PER_RUN = int(cfg["posting"].get("posts_per_run", 1))
-RATIO = cfg["posting"].get("language_ratio", [3,1])
+SPLIT_DELIM = "\n\n"
+# custom delimiter decoded once; allows something like "\n---\n" in config (interprets \n escapes)
+USER_DELIM = None
+PREF_CAPTION = False
+CAP_LEN = 1000
+POSTS_PER_RUN = 1
+RATIO = [3,1]
+# pacing: Telegram's 429 retry_after is the real rate limit, these are just floors
+POST_INTERVAL = 1.0
+CHUNK_DELAY = 0.05
+MAX_RETRIES = 5
+TELEGRAM_BOT_TOKEN = None
+CHANNEL_USERNAME = None
+
+def _load_config(path="config.yaml"):
+    """
+    Read config.yaml and the environment over the module-level defaults above.
+    Called from main() so importing this module stays cheap and side-effect free.
+    """
+    global STATE_FILE, IMAGE_INDEX_FILE, IMAGE_ROOT, HINDI_DOC, EN_DOC, SPLIT_DELIM, USER_DELIM
+    global PREF_CAPTION, CAP_LEN, POSTS_PER_RUN, RATIO, POST_INTERVAL, CHUNK_DELAY, MAX_RETRIES
+    global TELEGRAM_BOT_TOKEN, CHANNEL_USERNAME
+    import yaml
+
+    with open(path, "r", encoding="utf-8") as f:
+        cfg = yaml.safe_load(f)
+
+    STATE_FILE = cfg.get("state_file", STATE_FILE)
+    IMAGE_INDEX_FILE = cfg.get("image_index_file", IMAGE_INDEX_FILE)
+    IMAGE_ROOT = cfg["images"]["root_path"]
+    HINDI_DOC = cfg["google_doc"].get("hindi_doc_id")
+    EN_DOC = cfg["google_doc"].get("english_doc_id")
+    SPLIT_DELIM = cfg["content"].get("split_delimiter", SPLIT_DELIM)
+    USER_DELIM = None
+    if SPLIT_DELIM and SPLIT_DELIM.strip() not in ["", "\\n\\n", "\n\n"]:
+        USER_DELIM = SPLIT_DELIM.encode('utf-8').decode('unicode_escape')
+    PREF_CAPTION = cfg["content"].get("prefer_caption_for_short_posts", PREF_CAPTION)
+    CAP_LEN = int(cfg["content"].get("caption_max_length", CAP_LEN))
+    POSTS_PER_RUN = int(cfg["posting"].get("posts_per_run", POSTS_PER_RUN))
+    RATIO = cfg["posting"].get("language_ratio", RATIO)
+    POST_INTERVAL = float(cfg["posting"].get("post_interval_seconds", POST_INTERVAL))
+    CHUNK_DELAY = float(cfg["posting"].get("chunk_delay_seconds", CHUNK_DELAY))
+    MAX_RETRIES = int(cfg["posting"].get("max_retries", MAX_RETRIES))
+
+    TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
+    CHANNEL_USERNAME = os.environ.get("CHANNEL_USERNAME") or cfg.get("telegram_channel_username")
+    if not TELEGRAM_BOT_TOKEN or not CHANNEL_USERNAME:
+        raise SystemExit("Set TELEGRAM_BOT_TOKEN and CHANNEL_USERNAME in environment secrets.")
+
+# ----------------------------------------
+# Precompiled patterns
+# ----------------------------------------
+# stray \r left over once \r\n pairs are collapsed
+_CRLF_TABLE = str.maketrans({'\r': '\n'})
+_COLLAPSE_BLANK_RE = re.compile(r'\n{3,}')
+_INTERNAL_NL_RE = re.compile(r'\s*\n\s*')
+# a line that contains only dashes/underscores/em-dash (3 or more) possibly with surrounding spaces
+_SEP_RE = re.compile(r'\n\s*(?:[-–—]{3,}|_{3,})\s*\n', re.MULTILINE)
+
+# ----------------------------------------
+# HTTP sessions
+# ----------------------------------------
+# reuse keep-alive connections instead of a fresh TCP+TLS handshake per call
+def _make_session(pool_connections=2, pool_maxsize=4):
+    sess = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+    sess.mount("https://", adapter)
+    sess.headers.update({"Connection": "keep-alive"})
+    return sess
 
-TELEGRAM_BOT_TOKEN = os.environ.get("TELEGRAM_BOT_TOKEN")
-CHANNEL_USERNAME = os.environ.get("CHANNEL_USERNAME") or cfg.get("telegram_channel_username")
-if not TELEGRAM_BOT_TOKEN or not CHANNEL_USERNAME:
-    raise SystemExit("Set TELEGRAM_BOT_TOKEN and CHANNEL_USERNAME in environment secrets.")
+SESSION = _make_session()
+# separate session for sendPhoto so long uploads don't hold the sendMessage connection
+UPLOAD_SESSION = _make_session(pool_connections=1, pool_maxsize=1)
 
 # ----------------------------------------
 # Helpers
 # ----------------------------------------
+def _atomic_write(path, data):
+    # write to a temp file in the same directory, then swap it in
+    d = os.path.dirname(os.path.abspath(path))
+    os.makedirs(d, exist_ok=True)
+    # fsync before the swap so a crash leaves either the old or the new file;
+    # on any failure drop the temp file so no stray tmp* is left behind
+    tf = tempfile.NamedTemporaryFile("wb", dir=d, delete=False)
+    try:
+        with tf:
+            tf.write(data)
+            tf.flush()
+            os.fsync(tf.fileno())
+        # NamedTemporaryFile is 0600; keep the existing file's mode (or 0644 for new files)
+        try:
+            mode = os.stat(path).st_mode & 0o777
+        except FileNotFoundError:
+            mode = 0o644
+        os.chmod(tf.name, mode)
+        os.replace(tf.name, path)
+    except BaseException:
+        try:
+            os.unlink(tf.name)
+        except OSError:
+            pass
+        raise
+
+def _doc_cache_paths(doc_id):
+    base = os.path.join(DOC_CACHE_DIR, doc_id)
+    return base + ".txt", base + ".meta.json", base + ".msgs.json"
+
+def _load_doc_meta(meta_path):
+    # a missing or broken meta file just means no validators, so the doc is refetched
+    try:
+        with open(meta_path, "rb") as mf:
+            meta = _loads(mf.read())
+    except (OSError, ValueError):
+        return {}
+    return meta if isinstance(meta, dict) else {}
+
+def html_to_text(html):
+    # parse raw bytes so decoding happens once, inside the C parser;
+    # imported here since the txt export usually succeeds and this never runs
+    try:
+        from selectolax.lexbor import LexborHTMLParser
+    except ImportError:
+        from bs4 import BeautifulSoup
+        return BeautifulSoup(html, "lxml").get_text("\n")
+    tree = LexborHTMLParser(html)
+    node = tree.body if tree.body is not None else tree
+    return node.text(separator="\n")
+
 def fetch_doc_text(doc_id):
+    """
+    Fetch a Google Doc as text, revalidating the on-disk copy with ETag/Last-Modified.
+    Returns (text, meta, changed) where changed is False when the cached copy was reused.
+    The caller persists meta, so it is written once per fetch.
+    """
+    text_path, meta_path, _ = _doc_cache_paths(doc_id)
+    meta = _load_doc_meta(meta_path)
+    headers = {}
+    if os.path.exists(text_path):
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
     url = f"https://docs.google.com/document/d/{doc_id}/export?format=txt"
-    r = requests.get(url, timeout=30)
+    r = SESSION.get(url, headers=headers, timeout=30)
+    if r.status_code == 304:
+        try:
+            with open(text_path, "r", encoding="utf-8") as tf:
+                return tf.read(), meta, False
+        except (OSError, ValueError):
+            # cached text unreadable; fetch it again without validators
+            r = SESSION.get(url, timeout=30)
     if r.status_code == 200 and r.text.strip():
-        return r.text
-    r = requests.get(f"https://docs.google.com/document/d/{doc_id}/export?format=html", timeout=30)
-    if r.status_code == 200:
-        return BeautifulSoup(r.text, "html.parser").get_text("\n")
-    raise Exception(f"Cannot fetch doc {doc_id}: status {r.status_code}")
+        text = r.text
+        meta = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+    else:
+        r = SESSION.get(f"https://docs.google.com/document/d/{doc_id}/export?format=html", timeout=30)
+        if r.status_code != 200:
+            raise Exception(f"Cannot fetch doc {doc_id}: status {r.status_code}")
+        text = html_to_text(r.content)
+        # no validators for the html fallback, so the next run refetches
+        meta = {}
+    _atomic_write(text_path, text.encode("utf-8"))
+    return text, meta, True
+
+def load_doc_msgs(doc_id):
+    """
+    Fetch and split a doc, reusing the cached split list when the doc is unchanged.
+    """
+    text, meta, changed = fetch_doc_text(doc_id)
+    _, meta_path, msgs_path = _doc_cache_paths(doc_id)
+    # the split depends on the configured delimiter too
+    if not changed and meta.get("split_delimiter") == SPLIT_DELIM:
+        # a missing or broken split cache is rebuilt from the text below
+        try:
+            with open(msgs_path, "rb") as mf:
+                msgs = _loads(mf.read())
+            if isinstance(msgs, list):
+                return msgs
+        except (OSError, ValueError):
+            pass
+    msgs = split_msgs(text)
+    _atomic_write(msgs_path, _dumps(msgs))
+    meta["split_delimiter"] = SPLIT_DELIM
+    _atomic_write(meta_path, _dumps(meta))
+    return msgs
 
 def split_msgs(text):
     """
@@ -53,67 +232,141 @@ def split_msgs(text):
         return []
 
     # normalize
-    text = text.replace('\r\n', '\n').replace('\r', '\n')
-
-    # regex: match a line that contains only dashes/underscores/em-dash (3 or more) possibly with surrounding spaces
-    sep_pattern = re.compile(r'\n\s*(?:[-–—]{3,}|_{3,})\s*\n', flags=re.MULTILINE)
+    text = text.replace('\r\n', '\n').translate(_CRLF_TABLE)
 
-    # if explicit custom delimiter from config exists and is not the default, prefer that
-    if SPLIT_DELIM and SPLIT_DELIM.strip() not in ["", "\\n\\n", "\n\n"]:
-        # allow user to set something like "\n---\n" in config; interpret \n escapes
-        user_delim = SPLIT_DELIM.encode('utf-8').decode('unicode_escape')
-        parts = [p.strip() for p in text.split(user_delim) if p.strip()]
+    # if explicit custom delimiter from config exists, prefer that (literal str.split, no regex)
+    if USER_DELIM:
+        parts = [p.strip() for p in text.split(USER_DELIM) if p.strip()]
         if parts:
             return parts
 
-    # first try the strong separator pattern
-    parts = [p.strip() for p in re.split(sep_pattern, text) if p.strip()]
-    if len(parts) > 1:
-        return parts
+    # first try the strong separator pattern; the substring prefilter is exact
+    # (a run of 3+ dashes without an en/em dash must be "---") and skips the regex scan
+    if '---' in text or '___' in text or '–' in text or '—' in text:
+        parts = [p.strip() for p in _SEP_RE.split(text) if p.strip()]
+        if len(parts) > 1:
+            return parts
 
-    # fallback: split on 2+ blank lines (preserve paragraphs inside block)
-    parts = [p.strip() for p in re.split(r'\n{2,}', text) if p.strip()]
+    # fallback: split on 2+ blank lines (preserve paragraphs inside block);
+    # runs of 3+ newlines leave only empty/whitespace pieces, which strip() drops
+    parts = [p.strip() for p in text.split('\n\n') if p.strip()]
     return parts
 
-def gather_images(root):
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".webp")
+
+def _scan_images(root):
+    """
+    Single scandir pass over root and its subfolders.
+    Returns (images, dirs) where dirs are the folders whose mtimes guard the index.
+    """
     images = []
-    if not os.path.isdir(root):
-        return images
-    items = sorted(os.listdir(root), key=lambda x: (0, int(x)) if x.isdigit() else (1, x.lower()))
-    for it in items:
-        full = os.path.join(root, it)
-        if os.path.isdir(full):
-            for f in sorted(os.listdir(full)):
-                if f.lower().endswith((".jpg", ".jpeg", ".png", ".webp")):
-                    images.append(os.path.join(full, f))
-    # include root-level images
-    for f in sorted(os.listdir(root)):
-        fp = os.path.join(root, f)
-        if os.path.isfile(fp) and f.lower().endswith((".jpg", ".jpeg", ".png", ".webp")) and fp not in images:
+    seen = set()
+    dirs = [root]
+    with os.scandir(root) as it:
+        entries = list(it)
+    # classify and build the natural-sort key in one pass (numbers first, then names);
+    # the index keeps ties in scandir order, like a stable sorted()
+    keyed = []
+    for i, e in enumerate(entries):
+        if e.is_dir():
+            name = e.name
+            keyed.append(((0, int(name)) if name.isdigit() else (1, name.lower()), i, e))
+    keyed.sort()
+    for _, _, d in keyed:
+        dirs.append(d.path)
+        with os.scandir(d.path) as it:
+            names = sorted(e.name for e in it if e.name.lower().endswith(IMAGE_EXTS))
+        for f in names:
+            fp = os.path.join(d.path, f)
             images.append(fp)
+            seen.add(fp)
+    # include root-level images
+    for e in sorted(entries, key=lambda e: e.name):
+        if e.is_file() and e.name.lower().endswith(IMAGE_EXTS) and e.path not in seen:
+            images.append(e.path)
+            seen.add(e.path)
+    return images, dirs
+
+def _dir_mtimes(dirs):
+    return {d: os.stat(d).st_mtime_ns for d in dirs}
+
+def gather_images(root):
+    if not os.path.isdir(root):
+        return []
+    # reuse the last scan while none of the scanned folders changed
+    if os.path.exists(IMAGE_INDEX_FILE):
+        # a corrupt or unexpected index just falls through to a fresh scan
+        try:
+            with open(IMAGE_INDEX_FILE, "rb") as xf:
+                idx = _loads(xf.read())
+            if idx.get("root") == root and _dir_mtimes(idx["mtimes"]) == idx["mtimes"]:
+                return idx["images"]
+        except (OSError, KeyError, ValueError, AttributeError, TypeError):
+            pass
+    images, dirs = _scan_images(root)
+    idx = {"root": root, "mtimes": _dir_mtimes(dirs), "images": images}
+    _atomic_write(IMAGE_INDEX_FILE, _dumps(idx))
     return images
 
+def _read_file(path):
+    with open(path, "rb") as f:
+        while f.read(1 << 20):
+            pass
+
+def prefetch_file(path):
+    """
+    Ask the OS to pull a file into the page cache in the background,
+    so the next post's image read overlaps the current Telegram upload.
+    """
+    if not hasattr(os, "posix_fadvise"):
+        threading.Thread(target=_read_file, args=(path,), daemon=True).start()
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    finally:
+        os.close(fd)
+
 def load_state():
     if os.path.exists(STATE_FILE):
-        with open(STATE_FILE, "r", encoding="utf-8") as sf:
-            return json.load(sf)
-    s = {"h_msg_index":0, "e_msg_index":0, "img_index":0, "lang_counter":0}
-    with open(STATE_FILE, "w", encoding="utf-8") as sf:
-        json.dump(s, sf, ensure_ascii=False, indent=2)
-    return s
+        with open(STATE_FILE, "rb") as sf:
+            return _loads(sf.read())
+    # not persisted here; main saves once at the end of the run
+    return {"h_msg_index":0, "e_msg_index":0, "img_index":0, "lang_counter":0}
 
 def save_state(s):
-    with open(STATE_FILE, "w", encoding="utf-8") as sf:
-        json.dump(s, sf, ensure_ascii=False, indent=2)
+    _atomic_write(STATE_FILE, _dumps(s))
+
+def _retry_after(r):
+    """
+    Seconds Telegram asks us to wait on a 429, or None if the call was not rate limited.
+    """
+    if r.status_code != 429:
+        return None
+    try:
+        return float(r.json().get("parameters", {}).get("retry_after", 1))
+    except ValueError:
+        return 1.0
 
 def send_photo(bot_token, chat_id, image_path, caption=None):
     url = f"https://api.telegram.org/bot{bot_token}/sendPhoto"
-    with open(image_path, "rb") as f:
-        files = {"photo": f}
-        data = {"chat_id": chat_id}
-        if caption:
-            data["caption"] = caption
-        r = requests.post(url, files=files, data=data, timeout=60)
+    mime = mimetypes.guess_type(image_path)[0] or "application/octet-stream"
+    for attempt in range(MAX_RETRIES + 1):
+        # stream the file in chunks instead of buffering the whole multipart body in memory
+        with open(image_path, "rb") as f:
+            fields = {"chat_id": str(chat_id), "photo": (os.path.basename(image_path), f, mime)}
+            if caption:
+                fields["caption"] = caption
+            encoder = MultipartEncoder(fields=fields)
+            r = UPLOAD_SESSION.post(url, data=encoder, headers={"Content-Type": encoder.content_type}, timeout=60)
+        wait = _retry_after(r)
+        if wait is None or attempt == MAX_RETRIES:
+            break
+        print(f"sendPhoto rate limited, retrying in {wait}s")
+        time.sleep(wait)
     if r.status_code != 200:
         raise Exception(f"sendPhoto error {r.status_code}: {r.text}")
     return r.json()
@@ -121,7 +374,13 @@ def send_photo(bot_token, chat_id, image_path, caption=None):
 def send_message(bot_token, chat_id, text):
     url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
     data = {"chat_id": chat_id, "text": text, "parse_mode":"HTML"}
-    r = requests.post(url, data=data, timeout=30)
+    for attempt in range(MAX_RETRIES + 1):
+        r = SESSION.post(url, data=data, timeout=30)
+        wait = _retry_after(r)
+        if wait is None or attempt == MAX_RETRIES:
+            break
+        print(f"sendMessage rate limited, retrying in {wait}s")
+        time.sleep(wait)
     if r.status_code != 200:
         raise Exception(f"sendMessage error {r.status_code}: {r.text}")
     return r.json()
@@ -132,36 +391,52 @@ def choose_language(state):
     idx = state.get("lang_counter", 0) % total
     return "hindi" if idx < h_ratio else "english"
 
+def _pack_words(words, max_len):
+    """
+    Greedily pack words into space-joined chunks of at most max_len chars
+    (a single over-long word gets a chunk of its own). Linear: tracks the
+    running length instead of rebuilding the string per word.
+    """
+    chunks = []
+    buf = []
+    blen = 0
+    for w in words:
+        wl = len(w)
+        need = wl + (1 if buf else 0)
+        if blen + need <= max_len:
+            buf.append(w)
+            blen += need
+        else:
+            if buf:
+                chunks.append(" ".join(buf))
+            buf = [w]
+            blen = wl
+    if buf:
+        chunks.append(" ".join(buf))
+    return chunks
+
 def split_and_send_text(bot_token, chat_id, text, max_len=4000):
     # preserve paragraph boundaries while chunking
-    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = text.replace('\r\n', '\n').translate(_CRLF_TABLE)
     # collapse multiple blank lines to exactly two for consistency
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _COLLAPSE_BLANK_RE.sub('\n\n', text)
 
     # split into paragraphs on two newlines (we already used stronger separators earlier)
-    paragraphs = [p.strip() for p in re.split(r'\n{2,}', text) if p.strip()]
+    paragraphs = [p.strip() for p in text.split('\n\n') if p.strip()]
 
     chunks = []
     cur = ""
     for para in paragraphs:
         # collapse internal single newlines into spaces so paragraphs are single-line blocks
-        para_clean = re.sub(r'\s*\n\s*', ' ', para).strip()
+        para_clean = _INTERNAL_NL_RE.sub(' ', para).strip()
         if not cur:
             if len(para_clean) <= max_len:
                 cur = para_clean
             else:
                 # long paragraph -> break by words
-                words = para_clean.split()
-                tmp = ""
-                for w in words:
-                    if len(tmp) + (1 if tmp else 0) + len(w) <= max_len:
-                        tmp = (tmp + " " + w).strip()
-                    else:
-                        if tmp:
-                            chunks.append(tmp)
-                        tmp = w
-                if tmp:
-                    cur = tmp
+                packed = _pack_words(para_clean.split(), max_len)
+                chunks.extend(packed[:-1])
+                cur = packed[-1]
         else:
             candidate = cur + "\n\n" + para_clean
             if len(candidate) <= max_len:
@@ -171,63 +446,78 @@ def split_and_send_text(bot_token, chat_id, text, max_len=4000):
                 if len(para_clean) <= max_len:
                     cur = para_clean
                 else:
-                    words = para_clean.split()
-                    tmp = ""
-                    for w in words:
-                        if len(tmp) + (1 if tmp else 0) + len(w) <= max_len:
-                            tmp = (tmp + " " + w).strip()
-                        else:
-                            if tmp:
-                                chunks.append(tmp)
-                            tmp = w
-                    cur = tmp
+                    packed = _pack_words(para_clean.split(), max_len)
+                    chunks.extend(packed[:-1])
+                    cur = packed[-1]
     if cur:
         chunks.append(cur)
 
-    for part in chunks:
+    for i, part in enumerate(chunks):
+        if i:
+            # short gap only; send_message backs off on 429
+            time.sleep(CHUNK_DELAY)
         to_send = part if part.strip() else " "
         send_message(bot_token, chat_id, to_send)
-        time.sleep(1)
 
 def main():
+    _load_config()
     print("Poster start:", datetime.utcnow().isoformat())
-    hindi_msgs = split_msgs(fetch_doc_text(HINDI_DOC)) if HINDI_DOC else []
-    eng_msgs = split_msgs(fetch_doc_text(EN_DOC)) if EN_DOC else []
+    hindi_msgs = load_doc_msgs(HINDI_DOC) if HINDI_DOC else []
+    eng_msgs = load_doc_msgs(EN_DOC) if EN_DOC else []
     images = gather_images(IMAGE_ROOT)
     state = load_state()
+    saved = dict(state) if os.path.exists(STATE_FILE) else None
+    last_post = None
 
-    for _ in range(POSTS_PER_RUN):
-        lang = choose_language(state)
-        msgs = hindi_msgs if lang == "hindi" else eng_msgs
-        mi_key = "h_msg_index" if lang == "hindi" else "e_msg_index"
+    try:
+        for n in range(POSTS_PER_RUN):
+            lang = choose_language(state)
+            msgs = hindi_msgs if lang == "hindi" else eng_msgs
+            mi_key = "h_msg_index" if lang == "hindi" else "e_msg_index"
+            # read the counters once per iteration; written back below
+            mi = state.get(mi_key, 0)
+            ii = state.get("img_index", 0)
+            lc = state.get("lang_counter", 0)
 
-        if state.get(mi_key, 0) >= len(msgs):
-            print(f"No more {lang} messages available.")
-            state["lang_counter"] = state.get("lang_counter", 0) + 1
-            save_state(state)
-            continue
-        if state.get("img_index", 0) >= len(images):
-            print("No more images available.")
-            continue
+            if mi >= len(msgs):
+                print(f"No more {lang} messages available.")
+                state["lang_counter"] = lc + 1
+                continue
+            if ii >= len(images):
+                print("No more images available.")
+                continue
 
-        msg = msgs[state[mi_key]]
-        img = images[state["img_index"]]
+            msg = msgs[mi]
+            img = images[ii]
+            # warm the following image while this one uploads
+            if n + 1 < POSTS_PER_RUN and ii + 1 < len(images):
+                prefetch_file(images[ii + 1])
 
-        try:
-            if PREF_CAPTION and len(msg) <= CAP_LEN:
-                send_photo(TELEGRAM_BOT_TOKEN, CHANNEL_USERNAME, img, caption=msg)
-            else:
-                send_photo(TELEGRAM_BOT_TOKEN, CHANNEL_USERNAME, img, caption=None)
-                split_and_send_text(TELEGRAM_BOT_TOKEN, CHANNEL_USERNAME, msg, max_len=4000)
+            # keep separate posts to the channel ~POST_INTERVAL apart
+            if last_post is not None:
+                wait = POST_INTERVAL - (time.monotonic() - last_post)
+                if wait > 0:
+                    time.sleep(wait)
+
+            try:
+                if PREF_CAPTION and len(msg) <= CAP_LEN:
+                    send_photo(TELEGRAM_BOT_TOKEN, CHANNEL_USERNAME, img, caption=msg)
+                else:
+                    send_photo(TELEGRAM_BOT_TOKEN, CHANNEL_USERNAME, img, caption=None)
+                    split_and_send_text(TELEGRAM_BOT_TOKEN, CHANNEL_USERNAME, msg, max_len=4000)
 
-            state[mi_key] = state.get(mi_key, 0) + 1
-            state["img_index"] = state.get("img_index", 0) + 1
-            state["lang_counter"] = state.get("lang_counter", 0) + 1
+                state[mi_key] = mi + 1
+                state["img_index"] = ii + 1
+                state["lang_counter"] = lc + 1
+                last_post = time.monotonic()
+                print(f"Posted {lang} msg #{mi} with image #{ii}")
+            except Exception as e:
+                print("Posting error:", e)
+                break
+    finally:
+        # single write per run, skipped when nothing changed
+        if state != saved:
             save_state(state)
-            print(f"Posted {lang} msg #{state[mi_key]-1} with image #{state['img_index']-1}")
-        except Exception as e:
-            print("Posting error:", e)
-            break
 
 if __name__ == "__main__":
     main()